@@ -29,33 +29,63 @@ operators and compute average nominal returns over three horizons:
   * medium term: the last 36 months
   * long term: the last 60 months
 
-The script sleeps for 10 seconds between consecutive API calls to
-respect SUPEN’s guidance for page loading times.
+The three horizons are fetched concurrently, but the requests
+themselves are spaced at least 10 seconds apart to respect SUPEN’s
+guidance for page loading times.  The interval is measured from the
+start of the previous call, so time spent waiting for a response
+counts towards it.
 
 Example:
 
 ```
 $ python supen_analysis.py --out results.csv
 
-Operator; Short term; Medium term; Long term
-BN Vital; 8.75; 7.92; 7.10
-BCR Pensiones; 8.90; 8.05; 7.20
+Operator;Short term;Medium term;Long term
+BN Vital;8.75;7.92;7.10
+BCR Pensiones;8.90;8.05;7.20
 …
 ```
 
 To generate the ranking without saving to a file simply omit the
-`--out` argument.  The output will be printed to the console.
+`--out` argument.  The output will be printed to the console.  Use
+`--top N` to keep only the N best operators by long term return.
 
 Implementation notes
 --------------------
 
 * The script uses the `requests` library to perform HTTP GET
-  requests.  Each call is made with `verify=False` so that Python
-  will ignore invalid or self-signed certificates; if you prefer
-  strict verification you can remove this argument.
+  requests through a shared `requests.Session`, so connections are
+  reused and transient errors (429/502/503/504) are retried.
+  Certificates are verified against the default trust store.  If
+  SUPEN’s chain is not trusted there, set the `SUPEN_CA` environment
+  variable to the path of a CA bundle (PEM) that trusts it, or, as a
+  last resort, set `SUPEN_INSECURE=1` to skip verification.
+
+* HTTP/2 (e.g. via `httpx`) is deliberately not used.  Calls are
+  spaced `CALL_DELAY_SEC` apart, so there are never several requests
+  in flight to multiplex, and the keep-alive session already performs
+  a single TLS handshake that is reused by every horizon.
+
+* Responses are requested compressed (gzip/deflate, and brotli when
+  the `brotli` package is installed).  If SUPEN supports a `fields`
+  query parameter, set `SUPEN_SUPPORTS_FIELD_FILTER = True` to only
+  download the operator code and return columns.
+
+* API responses that contain records are cached under `~/.cache/supen` for six
+  hours, so re-running the script shortly afterwards does not contact
+  SUPEN again.  Pass `--refresh` to discard the cache and fetch fresh
+  data.
 
 * `pandas` is used for tabular data processing.  You can install it
-  with `pip install pandas`.
+  with `pip install pandas`.  It is only imported when saving to a
+  file or when the data is large; small console rankings are built
+  with the standard library.  If `orjson` is installed it is used to
+  parse the API responses; otherwise, or if it rejects a response
+  (e.g. one containing `NaN` literals), the standard `json` module is
+  used.  Pass `--arrow` to write the `--out` file with `pyarrow`
+  instead of pandas; note that its output differs slightly (strings
+  are quoted, integral returns are written as `8` rather than `8.0`
+  and exponents as `1e-7` rather than `1e-07`).
 
 * The list of operators and their codes must match the values
   expected by the SUPEN API.  The placeholder values below reflect
@@ -69,17 +99,40 @@ Implementation notes
 
 * The script automatically ranks the operators from highest to
   lowest based on the long term return.  If you prefer a different
-  ranking criterion, modify the `sort_values` call near the end of
-  the script.
+  ranking criterion, modify the sort in `create_ranking` and
+  `_ranking_rows` near the end of the script.
 """
 
+from __future__ import annotations
+
 import argparse
+import csv
+import hashlib
+import heapq
+import importlib.util
+import json
+import math
+import os
+import sys
+import threading
 import time
-from dataclasses import dataclass
-from typing import Dict, List, Optional
-
-import pandas as pd
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+try:
+    # orjson parses bytes directly and is several times faster than the
+    # standard library; it is optional (`pip install orjson`).
+    import orjson
+except ImportError:
+    orjson = None
+
+# `requests` and `pandas` are imported where they are used so that
+# `--help`, and importing this module as a library, stay fast.
+if TYPE_CHECKING:
+    import pandas as pd
+    import requests
 
 # Base URL for the SUPEN statistics API.  Note that only HTTPS is
 # documented.  If you encounter SSL issues from your environment,
@@ -94,22 +147,38 @@ BASE_URL = "https://webapps.supen.fi.cr/Estadisticas/API"
 # look: each endpoint returns a JSON object containing a list of
 # records, where each record has fields for the operator code and
 # return rate.  The `field` entry specifies which attribute should
-# be read to obtain the return.
+# be read to obtain the return, and `months` is the horizon length as
+# passed to the batch endpoint below.
 ENDPOINTS: Dict[str, Dict[str, str]] = {
     "short": {
         "endpoint": "/rendimientos/nominal/12meses",  # placeholder
         "field": "rendimiento",  # placeholder
+        "months": "12",
     },
     "medium": {
         "endpoint": "/rendimientos/nominal/36meses",  # placeholder
         "field": "rendimiento",  # placeholder
+        "months": "36",
     },
     "long": {
         "endpoint": "/rendimientos/nominal/60meses",  # placeholder
         "field": "rendimiento",  # placeholder
+        "months": "60",
     },
 }
 
+# Set to True if SUPEN serves every horizon from `BATCH_ENDPOINT` in one
+# call (e.g. `?meses=12,36,60`).  Each record must then carry its horizon
+# in one of `BATCH_HORIZON_KEYS`.  If the endpoint answers 400 or 404 the
+# per-horizon endpoints are used instead.
+SUPEN_SUPPORTS_BATCH = False
+BATCH_ENDPOINT = "/rendimientos/nominal"  # placeholder
+BATCH_HORIZON_KEYS = ("meses", "horizonte")
+
+# Candidate JSON keys holding the operator code in each record, in order
+# of preference.
+OPERATOR_KEYS = ("operadora", "operador", "codigo_operadora")
+
 # List of pension operators with their codes as recognised by SUPEN.
 # Replace the codes with the exact identifiers used by the API.
 OPERATORS = {
@@ -122,31 +191,257 @@ OPERATORS = {
     # Add or update operators as necessary
 }
 
-# Sleep duration between API calls (in seconds).
+# Operator names and codes as parallel tuples, computed once so the
+# ranking can be built column-wise without re-iterating `OPERATORS`.
+OP_NAMES: Tuple[str, ...] = tuple(OPERATORS)
+OP_CODES: Tuple[str, ...] = tuple(OPERATORS.values())
+
+# Inputs with fewer rows than this are handled with plain Python instead
+# of pandas: for a handful of operators, importing pandas costs far more
+# than the work it saves.
+STDLIB_MAX_ROWS = 100
+
+# Minimum interval between the start of two API calls (in seconds).
 CALL_DELAY_SEC = 10
 
-@dataclass
-class ReturnData:
-    """Container for return information across horizons for a single operator."""
-
-    operator: str
-    short: Optional[float] = None
-    medium: Optional[float] = None
-    long: Optional[float] = None
-
-    def as_dict(self) -> Dict[str, Optional[float]]:
-        return {
-            "Operator": self.operator,
-            "Short term": self.short,
-            "Medium term": self.medium,
-            "Long term": self.long,
+# Serialises access to the API so that concurrent fetches still honour
+# `CALL_DELAY_SEC`.  `_last_call_ts` holds the `time.monotonic()` value
+# of the most recent call.
+_rate_lock = threading.Lock()
+_last_call_ts: Optional[float] = None
+
+# Upper bound on concurrent fetches.  It sizes both the thread pool in
+# `collect_returns` and the session's connection pool, so adding
+# endpoints never opens more connections than can be reused.
+MAX_CONCURRENT_REQUESTS = 4
+
+# Shared HTTP session, created on first use by `get_session`.
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Set to True if the SUPEN API honours a `fields` query parameter, so that
+# only the operator code and return columns are transferred.
+SUPEN_SUPPORTS_FIELD_FILTER = False
+
+# Responses are cached on disk so that repeated runs within
+# `CACHE_TTL_SEC` do not hit the API again.  SUPEN statistics update at
+# most daily.  Set the `SUPEN_CACHE_DIR` environment variable to use a
+# different cache location.
+CACHE_DIR = Path(os.environ.get("SUPEN_CACHE_DIR", Path.home() / ".cache" / "supen"))
+CACHE_TTL_SEC = 6 * 60 * 60
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+
+def _create_session() -> requests.Session:
+    import requests
+    import urllib3
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import make_headers
+    from urllib3.util.retry import Retry
+
+    # Reusing one session keeps the TLS connection to SUPEN alive across
+    # horizons and retries transient server errors with backoff.
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=MAX_CONCURRENT_REQUESTS,
+            pool_maxsize=MAX_CONCURRENT_REQUESTS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=("GET",),
+                raise_on_status=False,
+            ),
+        ),
+    )
+    # Advertise every content encoding urllib3 can decode here: gzip and
+    # deflate always, plus br when `brotli` is installed.
+    session.headers.update(
+        {
+            "Accept": "application/json",
+            "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
         }
+    )
+
+    # Certificate verification uses the default trust store.  Point
+    # `SUPEN_CA` at a PEM bundle that trusts SUPEN’s chain if that is not
+    # enough, or set `SUPEN_INSECURE=1` to disable verification; only in
+    # that case is the insecure request warning silenced.
+    if os.environ.get("SUPEN_INSECURE") == "1":
+        session.verify = False
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    elif os.environ.get("SUPEN_CA"):
+        session.verify = os.environ["SUPEN_CA"]
+    return session
+
+
+def _wait_for_rate_limit() -> None:
+    """Block until at least `CALL_DELAY_SEC` has passed since the last API call."""
+    global _last_call_ts
+    with _rate_lock:
+        if _last_call_ts is not None:
+            wait = CALL_DELAY_SEC - (time.monotonic() - _last_call_ts)
+            if wait > 0:
+                time.sleep(wait)
+        _last_call_ts = time.monotonic()
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON body, preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity literals the standard
+            # library accepts; retry with it before giving up.
+            pass
+    return json.loads(data)
+
+
+def _cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
 
+def clear_cache() -> None:
+    """Remove every cached API response, on disk and in memory."""
+    fetch_returns_for_horizon.cache_clear()
+    if CACHE_DIR.is_dir():
+        for path in CACHE_DIR.glob("*.json"):
+            path.unlink(missing_ok=True)
 
-def fetch_returns_for_horizon(horizon: str) -> Dict[str, float]:
+
+def _get_records(url: str, params: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Return the list of records served at `url`, using the on-disk cache
+    when a fresh copy is available.
+
+    A response is only cached once a non-empty list of records has been
+    extracted from it, so maintenance pages or empty answers are never
+    served from the cache.
+
+    Raises
+    ------
+    requests.HTTPError
+        If the API call fails.
+    KeyError
+        If no list of records can be found in the response.
+    """
+    import requests
+
+    url = requests.Request("GET", url, params=params).prepare().url
+    path = _cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL_SEC:
+            records = _extract_records(_json_loads(path.read_bytes()))
+            if records:
+                return records
+    except (OSError, ValueError, KeyError):
+        pass
+
+    _wait_for_rate_limit()
+    response = get_session().get(url, timeout=30)
+    response.raise_for_status()
+    records = _extract_records(_json_loads(response.content))
+    if not records:
+        return records
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(response.content)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Caching is best effort; a read-only home directory must not
+        # prevent the analysis from running.
+        pass
+    return records
+
+
+def _extract_records(data: Any) -> List[Dict[str, Any]]:
+    """
+    Locate the list of records within the returned JSON.
+
+    Raises
+    ------
+    KeyError
+        If no list of records can be found.
+    """
+    # SUPEN’s API may wrap the list of records under different keys.
+    if isinstance(data, dict):
+        for key in ("datos", "data", "records", "result"):
+            if key in data and isinstance(data[key], list):
+                return data[key]
+        raise KeyError(
+            "Could not locate a list of records in the API response."
+        )
+    if isinstance(data, list):
+        return data
+    raise KeyError(
+        f"Unexpected JSON structure: expected list or dict, got {type(data)}"
+    )
+
+
+def _parse_returns(records: List[Dict[str, Any]], val_key: str) -> Dict[str, float]:
+    """Map each record's operator code to the float stored under `val_key`."""
+    # Records share a schema, so resolve the operator code key once from
+    # the first record instead of probing every candidate on every row.
+    probe = records[0] if records else {}
+    op_key = next((k for k in OPERATOR_KEYS if k in probe), None)
+
+    if op_key is None:
+        return {}
+
+    if len(records) < STDLIB_MAX_ROWS:
+        result: Dict[str, float] = {}
+        for rec in records:
+            operator_code = rec.get(op_key)
+            value = rec.get(val_key)
+            if operator_code is None or value is None:
+                continue
+            code = str(operator_code).strip()
+            if not code:
+                continue
+            try:
+                number = float(value)
+            except (ValueError, TypeError):
+                continue
+            # NaN/inf would sort ahead of real returns; treat them as missing.
+            if math.isfinite(number):
+                result[code] = number
+        return result
+
+    import numpy as np
+    import pandas as pd
+
+    # Convert the whole column set at once instead of calling float() and
+    # str.strip() per record.
+    df = pd.DataFrame.from_records(records)
+    if val_key not in df.columns:
+        return {}
+    codes = df[op_key].astype("string").str.strip()
+    values = pd.to_numeric(df[val_key], errors="coerce").astype(float)
+    mask = codes.notna() & (codes != "") & np.isfinite(values)
+    return dict(zip(codes[mask], values[mask]))
+
+
+@lru_cache(maxsize=32)
+def fetch_returns_for_horizon(horizon: str) -> Tuple[Tuple[str, float], ...]:
     """
     Fetch the nominal returns for a given horizon from the SUPEN API.
 
+    Results are memoised for the lifetime of the process; call
+    `clear_cache` to force a new fetch.
+
     Parameters
     ----------
     horizon : str
@@ -154,8 +449,10 @@ def fetch_returns_for_horizon(horizon: str) -> Dict[str, float]:
 
     Returns
     -------
-    Dict[str, float]
-        A mapping from operator code to nominal return rate.
+    Tuple[Tuple[str, float], ...]
+        (operator code, nominal return rate) pairs.  The result is
+        immutable because it is shared between callers; pass it to
+        `dict()` for lookups.
 
     Raises
     ------
@@ -168,91 +465,197 @@ def fetch_returns_for_horizon(horizon: str) -> Dict[str, float]:
         raise ValueError(f"Unsupported horizon '{horizon}'.")
     cfg = ENDPOINTS[horizon]
     url = f"{BASE_URL}{cfg['endpoint']}"
+    params = None
+    if SUPEN_SUPPORTS_FIELD_FILTER:
+        params = {"fields": ",".join(OPERATOR_KEYS + (cfg["field"],))}
+    records = _get_records(url, params)
+    return tuple(_parse_returns(records, cfg["field"]).items())
 
-    # Perform the GET request.  Disable certificate verification to avoid
-    # SSL errors.  You may set `verify=True` if your environment trusts
-    # SUPEN’s certificate.
-    response = requests.get(url, timeout=30, verify=False)
-    response.raise_for_status()
-    data = response.json()
 
-    # Try to locate a list of records within the returned JSON.  SUPEN’s API
-    # may wrap the list of records under different keys.
-    if isinstance(data, dict):
-        records = None
-        for key in ("datos", "data", "records", "result"):
-            if key in data and isinstance(data[key], list):
-                records = data[key]
-                break
-        if records is None:
-            raise KeyError(
-                "Could not locate a list of records in the API response."
-            )
-    elif isinstance(data, list):
-        records = data
-    else:
-        raise KeyError(
-            f"Unexpected JSON structure: expected list or dict, got {type(data)}"
-        )
+def fetch_all_horizons() -> Optional[Dict[str, Dict[str, float]]]:
+    """
+    Fetch the nominal returns for every horizon with a single API call.
+
+    Uses `BATCH_ENDPOINT`, asking for all the `months` values listed in
+    `ENDPOINTS` at once, and splits the records by their horizon field.
+
+    Returns
+    -------
+    Optional[Dict[str, Dict[str, float]]]
+        The same mapping as `collect_returns`, or None if the batch
+        endpoint is not available (HTTP 400/404, or records without a
+        horizon field).
+
+    Raises
+    ------
+    requests.HTTPError
+        If the API call fails for any other reason.
+    KeyError
+        If no list of records is found in the returned JSON.
+    """
+    import requests
+
+    months = {cfg["months"]: horizon for horizon, cfg in ENDPOINTS.items()}
+    params = {"meses": ",".join(months)}
+    if SUPEN_SUPPORTS_FIELD_FILTER:
+        fields = {cfg["field"] for cfg in ENDPOINTS.values()}
+        params["fields"] = ",".join(OPERATOR_KEYS + BATCH_HORIZON_KEYS + tuple(sorted(fields)))
+    try:
+        records = _get_records(f"{BASE_URL}{BATCH_ENDPOINT}", params)
+    except requests.HTTPError as err:
+        if err.response is not None and err.response.status_code in (400, 404):
+            return None
+        raise
+
+    probe = records[0] if records else {}
+    horizon_key = next((k for k in BATCH_HORIZON_KEYS if k in probe), None)
+    if horizon_key is None:
+        return None
 
-    result: Dict[str, float] = {}
+    grouped: Dict[str, List[Dict[str, Any]]] = {horizon: [] for horizon in ENDPOINTS}
     for rec in records:
-        try:
-            operator_code = rec.get("operadora", rec.get("operador", rec.get("codigo_operadora")))
-            value = rec[cfg["field"]]
-            if operator_code:
-                result[str(operator_code).strip()] = float(value)
-        except (KeyError, ValueError, TypeError):
-            continue
-    return result
+        horizon = months.get(str(rec.get(horizon_key)).strip())
+        if horizon is not None:
+            grouped[horizon].append(rec)
+    return {
+        horizon: _parse_returns(recs, ENDPOINTS[horizon]["field"])
+        for horizon, recs in grouped.items()
+    }
 
 
-def collect_returns() -> List[ReturnData]:
+def collect_returns() -> Dict[str, Dict[str, float]]:
     """
     Collect return information for all operators across all horizons.
 
+    If `SUPEN_SUPPORTS_BATCH` is set, all horizons are first requested in
+    a single call.  Every entry of `ENDPOINTS` that this did not cover
+    (all of them without batching, or if it fails) is then fetched from
+    its own endpoint concurrently, so new horizons only need to be added
+    there.
+
     Returns
     -------
-    List[ReturnData]
-        A list containing one ReturnData object per operator.
+    Dict[str, Dict[str, float]]
+        A mapping from horizon ("short", "medium" or "long") to the
+        operator code → nominal return mapping for that horizon.
     """
-    short_data = fetch_returns_for_horizon("short")
-    time.sleep(CALL_DELAY_SEC)
-    medium_data = fetch_returns_for_horizon("medium")
-    time.sleep(CALL_DELAY_SEC)
-    long_data = fetch_returns_for_horizon("long")
-
-    results: List[ReturnData] = []
-    for name, code in OPERATORS.items():
-        rd = ReturnData(
-            operator=name,
-            short=short_data.get(code),
-            medium=medium_data.get(code),
-            long=long_data.get(code),
-        )
-        results.append(rd)
-    return results
-
-
-def create_ranking(returns: List[ReturnData]) -> pd.DataFrame:
+    returns: Dict[str, Dict[str, float]] = {}
+    if SUPEN_SUPPORTS_BATCH:
+        returns = fetch_all_horizons() or {}
+
+    # Horizons the batch call did not cover (or all of them, without it).
+    missing = [h for h in ENDPOINTS if not returns.get(h)]
+    if missing:
+        workers = min(MAX_CONCURRENT_REQUESTS, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {h: ex.submit(fetch_returns_for_horizon, h) for h in missing}
+            for h, future in futures.items():
+                returns[h] = dict(future.result())
+    return {h: returns[h] for h in ENDPOINTS}
+
+
+def _returns_by_operator(
+    returns: Dict[str, Dict[str, float]]
+) -> List[Dict[str, float]]:
+    """
+    Invert the per-horizon returns into one horizon → return mapping per
+    operator, in `OP_CODES` order.  Codes not listed in `OPERATORS` are
+    dropped.
+    """
+    by_op: Dict[str, Dict[str, float]] = {code: {} for code in OP_CODES}
+    for horizon, data in returns.items():
+        for code, value in data.items():
+            entry = by_op.get(code)
+            if entry is not None:
+                entry[horizon] = value
+    return [by_op[code] for code in OP_CODES]
+
+
+def create_ranking(
+    returns: Dict[str, Dict[str, float]], top: Optional[int] = None
+) -> pd.DataFrame:
     """
     Create a DataFrame ranking the operators by long term return.
 
     Parameters
     ----------
-    returns : List[ReturnData]
-        The list of return data objects.
+    returns : Dict[str, Dict[str, float]]
+        The per-horizon returns, as produced by `collect_returns`.
+    top : Optional[int]
+        If given, only the `top` operators with the highest long term
+        return are kept.  Operators without a long term return are then
+        omitted.
 
     Returns
     -------
     pd.DataFrame
         A DataFrame sorted by the long term return in descending order.
     """
-    df = pd.DataFrame([rd.as_dict() for rd in returns])
-    df_sorted = df.sort_values(by="Long term", ascending=False, na_position="last")
+    import numpy as np
+    import pandas as pd
+
+    by_op = _returns_by_operator(returns)
+    df = pd.DataFrame(
+        {
+            "Operator": OP_NAMES,
+            "Short term": [r.get("short") for r in by_op],
+            "Medium term": [r.get("medium") for r in by_op],
+            "Long term": [r.get("long") for r in by_op],
+        }
+    ).astype({"Short term": float, "Medium term": float, "Long term": float})
+    if top:
+        # Partial selection: cheaper than a full sort when only the head
+        # of the ranking is wanted.
+        return df.nlargest(top, "Long term")
+    # Sort on the raw float64 array: missing returns become -inf so they
+    # end up last, and a stable argsort keeps ties in `OPERATORS` order.
+    long_term = df["Long term"].to_numpy(dtype="float64", na_value=-np.inf)
+    df_sorted = df.iloc[np.argsort(-long_term, kind="stable")]
     return df_sorted
 
 
+def save_ranking(ranking_df: pd.DataFrame, path: str, use_arrow: bool = False) -> None:
+    """
+    Write the ranking to `path` as CSV.
+
+    By default `DataFrame.to_csv` is used.  With `use_arrow`, Arrow's CSV
+    writer (which serialises in native code) is used instead; it requires
+    `pyarrow` and formats the file differently: strings are quoted,
+    integral floats lose their trailing ".0" and exponents are not
+    zero-padded.
+    """
+    if not use_arrow:
+        ranking_df.to_csv(path, index=False)
+        return
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    table = pa.Table.from_pandas(ranking_df, preserve_index=False)
+    pacsv.write_csv(table, path)
+
+
+def _ranking_rows(
+    returns: Dict[str, Dict[str, float]], top: Optional[int] = None
+) -> List[Tuple[str, Optional[float], Optional[float], Optional[float]]]:
+    """Plain-Python equivalent of `create_ranking`, returning one tuple per operator."""
+    rows = [
+        (name, r.get("short"), r.get("medium"), r.get("long"))
+        for name, r in zip(OP_NAMES, _returns_by_operator(returns))
+    ]
+    if top:
+        return heapq.nlargest(top, (r for r in rows if r[3] is not None), key=lambda r: r[3])
+    rows.sort(key=lambda r: (r[3] is None, -(r[3] or 0)))
+    return rows
+
+
+def _print_ranking_stdlib(
+    rows: List[Tuple[str, Optional[float], Optional[float], Optional[float]]]
+) -> None:
+    writer = csv.writer(sys.stdout, delimiter=";", lineterminator="\n")
+    writer.writerow(("Operator", "Short term", "Medium term", "Long term"))
+    writer.writerows(rows)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Analyse SUPEN pension operator returns.")
     parser.add_argument(
@@ -260,28 +663,69 @@ def main() -> None:
         metavar="PATH",
         help="Optional path to a CSV file where the ranking will be saved.",
     )
+    parser.add_argument(
+        "--arrow",
+        action="store_true",
+        help="Write the --out file with pyarrow's CSV writer (requires pyarrow).",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached API responses and fetch fresh data from SUPEN.",
+    )
+    parser.add_argument(
+        "--top",
+        metavar="N",
+        type=int,
+        default=None,
+        help="Only show the N operators with the highest long term return.",
+    )
     args = parser.parse_args()
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be a positive integer")
+    if args.arrow and not args.out:
+        parser.error("--arrow requires --out")
+    if args.arrow and importlib.util.find_spec("pyarrow") is None:
+        parser.error("--arrow requires pyarrow (pip install pyarrow)")
+
+    if args.refresh:
+        clear_cache()
+
+    import requests
 
     try:
-        returns_list = collect_returns()
+        returns = collect_returns()
     except requests.HTTPError as err:
         print(f"HTTP error when contacting SUPEN API: {err}")
         return
+    except requests.exceptions.SSLError as err:
+        print(
+            f"TLS error when contacting SUPEN API: {err}  Set SUPEN_CA to a "
+            "CA bundle that trusts SUPEN, or SUPEN_INSECURE=1 to skip "
+            "verification."
+        )
+        return
     except KeyError as err:
-        print(f"Unexpected data format: {err}")
+        print(
+            f"Unexpected data format: {err}  If the API has recovered, "
+            "run again with --refresh to ignore cached responses."
+        )
         return
     except Exception as err:
         print(f"An error occurred: {err}")
         return
 
-    ranking_df = create_ranking(returns_list)
-
     # Print ranking to console using semicolon separator to avoid CSV
     # delimiter collisions with European decimal commas if present.
-    print(ranking_df.to_csv(index=False, sep="; "))
+    if not args.out and len(OPERATORS) < STDLIB_MAX_ROWS:
+        _print_ranking_stdlib(_ranking_rows(returns, top=args.top))
+        return
+
+    ranking_df = create_ranking(returns, top=args.top)
+    print(ranking_df.to_csv(index=False, sep=";"))
 
     if args.out:
-        ranking_df.to_csv(args.out, index=False)
+        save_ranking(ranking_df, args.out, use_arrow=args.arrow)
         print(f"Results saved to {args.out}")
 
 
@@ -0,0 +1,38 @@
+import math
+
+import pytest
+
+import supen_analysis
+
+RECORD_SETS = [
+    [
+        {"operadora": "BNV", "rendimiento": "NaN"},
+        {"operadora": "BCR", "rendimiento": 5},
+    ],
+    [
+        {"operadora": "A", "rendimiento": math.nan},
+        {"operadora": "B", "rendimiento": "inf"},
+        {"operadora": "C", "rendimiento": -math.inf},
+        {"operadora": "D", "rendimiento": "7.5"},
+    ],
+    [
+        {"operadora": "  ", "rendimiento": 1},
+        {"operadora": "", "rendimiento": 2},
+        {"operadora": None, "rendimiento": 3},
+        {"operadora": 0, "rendimiento": 4},
+        {"operadora": " A ", "rendimiento": "5"},
+        {"operadora": "B", "rendimiento": "x"},
+        {"operadora": "C"},
+    ],
+]
+
+
+@pytest.mark.parametrize("records", RECORD_SETS)
+def test_parse_returns_matches_on_both_sides_of_stdlib_threshold(records, monkeypatch):
+    pytest.importorskip("pandas")
+    monkeypatch.setattr(supen_analysis, "STDLIB_MAX_ROWS", len(records) + 1)
+    stdlib_result = supen_analysis._parse_returns(records, "rendimiento")
+    monkeypatch.setattr(supen_analysis, "STDLIB_MAX_ROWS", 0)
+    pandas_result = supen_analysis._parse_returns(records, "rendimiento")
+    assert stdlib_result == pandas_result
+    assert all(math.isfinite(v) for v in stdlib_result.values())